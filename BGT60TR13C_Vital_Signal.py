@@ -16,18 +16,32 @@ import time
 
 import numpy as np
 import pyqtgraph as pg
+import scipy.fft as sfft
 import scipy.signal as signal
-import statsmodels.api as sm
 from PyQt5.QtCore import QTimer
-from PyQt5.QtWidgets import QApplication, QFrame, QGridLayout, QLabel, QVBoxLayout, QWidget
+from PyQt5.QtWidgets import QApplication, QFrame, QGraphicsItem, QGridLayout, QLabel, QVBoxLayout, QWidget
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 from ifxradarsdk import get_version
 from ifxradarsdk.fmcw import DeviceFmcw
 from ifxradarsdk.fmcw.types import create_dict_from_sequence, FmcwSimpleSequenceConfig, FmcwSequenceChirp
 from pyqtgraph.Qt import QtCore
+from scipy.linalg import cholesky_banded
 from scipy.ndimage import uniform_filter1d
-from scipy.signal import lfilter, firwin, find_peaks
-from pythonosc import udp_client  # Add OSC client import
+from scipy.signal import firwin, find_peaks
+from vitals_kernels import best_peak, continue_unwrap, fir_filter_valid, hp_filter_cycle, window_vital_signs
+from pythonosc import osc_bundle_builder, osc_message_builder, udp_client  # Add OSC client import
+
+# FFTW (pyfftw) serves the scipy.fft calls when it is installed, pocketfft otherwise. The transform sizes never
+# change, so the cached FFTW plans are reused frame after frame
+try:
+    import pyfftw.interfaces.cache
+    import pyfftw.interfaces.scipy_fft
+
+    pyfftw.interfaces.cache.enable()
+    pyfftw.interfaces.cache.set_keepalive_time(10)
+    sfft.set_global_backend(pyfftw.interfaces.scipy_fft)
+except ImportError:
+    pass
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 ENABLE_RANGE_PROFILE_PLOT = True
@@ -36,6 +50,8 @@ ENABLE_VITALSIGNS_SPECTRUM = True
 ENABLE_ESTIMATION_PLOT = True
 ENABLE_BREATHING_VISUALIZATION = True  # New flag for breathing visualization
 ENABLE_OSC_OUTPUT = True  # New flag for OSC output
+ENABLE_OSC_LOGGING = False  # print the sent OSC values, from a background thread
+ENABLE_OPENGL = True  # draw the figures through OpenGL instead of QPainter
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # Device settings
 num_rx_antennas = 3
@@ -54,24 +70,41 @@ buffer_time = 5 * processing_window_time  # second
 estimation_time = 5  # second
 time_offset_synch_plots = 1.0  # second
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-figure_update_time = 25  # m second
+figure_update_time = 25  # m second, rate estimates, breathing circle and OSC output
+plot_update_time = 200  # m second, figures
+region_update_delay = 50  # m second, a dragged region is applied once it has been still this long
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 fft_size_range_profile = samples_per_chirp * 2
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 object_distance_start_range = 0.5
 object_distance_stop_range = 0.6
 epsilon_value = 0.00000001
-# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-# peak detection
-peak_finding_distance = 0.01
+rad_to_deg = 180 / np.pi
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 buffer_data_size = int(buffer_time * vital_signs_sample_rate)
 processing_data_size = int(processing_window_time * vital_signs_sample_rate)
 fft_size_vital_signs = processing_data_size * 4
+# window coefficients, fixed for the whole session, in the precision of the FFT inputs
+range_window = signal.windows.blackmanharris(samples_per_chirp).astype(np.float32)
+vital_signs_window = signal.windows.blackmanharris(processing_data_size).astype(np.float32)
+# threads used by scipy.fft for the vital signs transforms (-1: all cores), the small range FFT stays single threaded
+fft_workers = -1
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 estimation_rate = vital_signs_sample_rate  # Hz
 estimation_index_breathing = buffer_data_size - estimation_time * estimation_rate
 estimation_index_heart = buffer_data_size - estimation_time * estimation_rate
+# last estimation_time seconds of the index buffers
+estimation_slice_breathing = slice(estimation_index_breathing, None)
+estimation_slice_heart = slice(estimation_index_heart, None)
+# window lengths in samples
+range_peak_average_size = 2 * vital_signs_sample_rate  # range bin averaging for the slow-time signal
+breathing_points_window_size = int(10 * vital_signs_sample_rate)  # inhalation/exhalation search
+breathing_points_distance = int(vital_signs_sample_rate / 2)  # 最小距离（基于呼吸频率）
+# most peaks plus valleys the search window can hold at that distance
+breathing_points_capacity = 2 * (breathing_points_window_size // breathing_points_distance + 1)
+breathing_points_interval = 5  # frames between two inhalation/exhalation searches
+breathing_circle_window_size = int(5 * vital_signs_sample_rate)  # circle size normalization
+estimation_window_size = int(estimation_time * vital_signs_sample_rate)  # averaged rate estimates
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # filter initial coefficients
 # Calculate normalized cutoff frequencies for breathing
@@ -84,13 +117,49 @@ nyquist_freq = 0.5 * vital_signs_sample_rate
 filter_order = vital_signs_sample_rate + 1
 breathing_b = firwin(filter_order, [low_breathing / nyquist_freq, high_breathing / nyquist_freq], pass_zero=False)
 heart_b = firwin(filter_order, [low_heart / nyquist_freq, high_heart / nyquist_freq], pass_zero=False)
-index_start_breathing = int(low_breathing / vital_signs_sample_rate * fft_size_vital_signs)
-index_end_breathing = int(high_breathing / vital_signs_sample_rate * fft_size_vital_signs)
-index_start_heart = int(low_heart / vital_signs_sample_rate * fft_size_vital_signs)
-index_end_heart = int(high_heart / vital_signs_sample_rate * fft_size_vital_signs)
+# FFT bins per Hz of the vital signs spectra
+hz_to_bin = fft_size_vital_signs / vital_signs_sample_rate
+# beats / breaths per minute of one FFT bin
+bin_to_bpm = 60 / hz_to_bin
+# empirical correction of the reported rates. The -2 BPM was tuned when rates were read off the linspace spectrum
+# axis, which puts bin k at (k + 0.5) * fs / (N - 1), half a bin high; that half bin is kept so the calibration holds
+rate_offset_bpm = 0.5 * bin_to_bpm - 2
+index_start_breathing = int(low_breathing * hz_to_bin)
+index_end_breathing = int(high_breathing * hz_to_bin)
+index_start_heart = int(low_heart * hz_to_bin)
+index_end_heart = int(high_heart * hz_to_bin)
+# breathing smoothing: Savitzky-Golay filter followed by a 5 point moving average
+breathing_savgol_length = min(51, processing_data_size - 2)  # 确保窗口长度是奇数且小于数据长度
+if breathing_savgol_length % 2 == 0:
+    breathing_savgol_length -= 1
+# only the newest outputs are used each frame and they depend on the last breathing_savgol_length band-passed
+# samples alone, so both filters fold into one fixed matrix applied to that tail
+breathing_smoothing = uniform_filter1d(
+    signal.savgol_filter(np.eye(breathing_savgol_length), breathing_savgol_length, 3, axis=0), size=5, axis=0)
+# Hodrick-Prescott filter: the trend solves (I + lambda * D'D) trend = x, D being the second difference operator.
+# The matrix only depends on the window length, so its banded Cholesky factor is computed once
+hp_filter_lambda = 3 * vital_signs_sample_rate
+hp_filter_banded = np.zeros((3, processing_data_size))
+hp_filter_banded[0, 2:] = hp_filter_lambda
+hp_filter_banded[1, 1:] = -4 * hp_filter_lambda
+hp_filter_banded[1, [1, -1]] = -2 * hp_filter_lambda
+hp_filter_banded[2, :] = 1 + 6 * hp_filter_lambda
+hp_filter_banded[2, [0, -1]] = 1 + hp_filter_lambda
+hp_filter_banded[2, [1, -2]] = 1 + 5 * hp_filter_lambda
+hp_filter_cholesky = cholesky_banded(hp_filter_banded)
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-data_queue = queue.Queue()
+# bounded so a stalled processing thread cannot pile up frames; the reader drops the oldest one instead
+data_queue_size = 4
+data_queue = queue.Queue(maxsize=data_queue_size)
+# set by the processing thread after each frame, the output and plot timers skip their update while nothing new
+# was processed. Each timer clears its own event
+new_frame_ready = threading.Event()
+new_plot_data = threading.Event()
+# sent OSC values waiting to be printed, entries are dropped rather than blocking the GUI thread when it is full
+osc_log_queue = queue.Queue(maxsize=64)
+# messages of the last OSC bundle, an identical bundle is not sent again
+last_osc_messages = None
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # Initial time
@@ -101,6 +170,71 @@ neulog_start_time = start_time
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 range_profile_peak_index = 0
 max_index_processing = True
+# range bins of the selected distance interval
+start_index_range = 0
+stop_index_range = 0
+
+
+def update_range_indices():
+    # only changes with the selected interval, not per frame
+    global start_index_range, stop_index_range
+    start_index_range = int(object_distance_start_range / max_range * fft_size_range_profile / 2)
+    stop_index_range = int(object_distance_stop_range / max_range * fft_size_range_profile / 2)
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# circular buffer
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+class CircularBuffer:
+    # every sample is stored twice (at idx and idx + size) so the newest samples are always a contiguous view
+    def __init__(self, size, dtype=np.float64):
+        self.size = size
+        self.buf = np.zeros(2 * size, dtype=dtype)
+        self.idx = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, value):
+        self.buf[self.idx] = value
+        self.buf[self.idx + self.size] = value
+        self.idx = (self.idx + 1) % self.size
+
+    def extend(self, values):
+        for value in values:
+            self.push(value)
+
+    def push_or_repeat(self, value):
+        # None means no new value, the last one is carried forward
+        self.push(self.last() if value is None else value)
+
+    def last(self):
+        return self.buf[self.idx + self.size - 1]
+
+    def recent(self, count=None):
+        # oldest to newest, zero-copy. The view is live storage: a push from the processing thread can overwrite its
+        # oldest sample while another thread reads it, so the GUI side copies it (or into a snapshot) first
+        if count is None:
+            count = self.size
+        stop = self.idx + self.size
+        return self.buf[stop - count:stop]
+
+
+class RollingMean:
+    # mean of the last size pushed values, kept as a running sum: add the new value, subtract the one leaving
+    def __init__(self, size):
+        self.window = CircularBuffer(size)
+        self.total = 0.0
+
+    def push(self, value):
+        self.total += value - self.window.recent()[0]
+        self.window.push(value)
+
+    @property
+    def value(self):
+        return self.total / self.window.size
+
+
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # data queue
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -109,235 +243,260 @@ def read_data(device):
     while True:
         frame_contents = device.get_next_frame()
         for frame in frame_contents:
-            data_queue.put(frame)
+            while True:
+                try:
+                    data_queue.put_nowait(frame)
+                    break
+                except queue.Full:
+                    try:
+                        data_queue.get_nowait()
+                    except queue.Empty:
+                        pass
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # processing class
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 class RadarDataProcessor:
-    def calc_range_fft(self, data_queue):
-        if not data_queue.empty():
-            frame = data_queue.get()
-            _, num_chirps_per_frame, num_samples_per_chirp = np.shape(frame)
-            range_fft_antennas_buffer = np.zeros(int(fft_size_range_profile / 2), dtype=np.complex128)
-            for iAnt in range(num_rx_antennas):
-                # for iChirps in range(num_chirps_per_frame):
-                mat = frame[iAnt, :, :]
-                avgs = np.average(mat, 1).reshape(num_chirps_per_frame, 1)
-                mat = mat - avgs
-                mat = np.multiply(mat,
-                                  signal.windows.blackmanharris(num_samples_per_chirp).reshape(1,
-                                                                                               num_samples_per_chirp))
-                zp1 = np.pad(mat, ((0, 0), (0, fft_size_range_profile - num_samples_per_chirp)), 'constant')
-                range_fft = np.fft.fft(zp1, fft_size_range_profile) / num_samples_per_chirp
-                range_fft = 2 * range_fft[:, :int(fft_size_range_profile / 2)]
-                temp_range_fft = np.sum(range_fft, axis=0)
-                range_fft_antennas_buffer = temp_range_fft + range_fft_antennas_buffer
-            return range_fft_antennas_buffer / num_rx_antennas
-        return None, None
-
-    def find_signal_peaks(self, fft_windowed_signal, index_start, index_end, distance):
-        signal_region = fft_windowed_signal[index_start: index_end]
-        peaks, _ = find_peaks(signal_region,
-                              distance=int(max(1, distance * fft_size_vital_signs / vital_signs_sample_rate)))
-        # Filter peaks within the boundaries
-        # filtered_peaks = peaks[(peaks > 0) & (peaks < len(signal_region) - 1)]
-        rate_index = 0
-        filtered_peaks = peaks
-        if len(filtered_peaks) > 0:
-            best_peak_index = np.argmax(signal_region[filtered_peaks])
-            rate_index = filtered_peaks[best_peak_index] + index_start
-        return rate_index
+    def __init__(self):
+        # zero-padded range FFT input (the padding is never written) and the antenna sum it reduces to
+        self.range_fft_input = np.zeros((num_rx_antennas, number_of_chirps, fft_size_range_profile), dtype=np.float32)
+        self.range_fft_output = np.zeros(int(fft_size_range_profile / 2), dtype=np.complex64)
+        # zero-padded vital signs FFT inputs, only the first processing_data_size samples are rewritten
+        # rows: unwrapped phase, breathing, heart (zero padded, transformed in one batch)
+        self.fft_scratch = np.zeros((3, fft_size_vital_signs), dtype=np.float32)
+        self.fft_scratch_complex = np.zeros(fft_size_vital_signs, dtype=np.complex64)
+        # last wrapped / unwrapped phase sample, unwrapping carries on from here
+        self.last_wrapped_phase = 0.0
+        self.last_unwrapped_phase = 0.0
+        # per-frame kernel outputs, sliced to the number of new samples
+        self.unwrap_output = np.zeros(processing_data_size)
+        self.breathing_filter_output = np.zeros(processing_data_size)
+        self.heart_filter_output = np.zeros(processing_data_size)
+        self.hp_filter_output = np.zeros(processing_data_size)
+        # inhalation / exhalation points, two alternating slots so the published set is never rewritten while
+        # the GUI thread may still be reading it
+        self.breathing_points_x = np.zeros((2, breathing_points_capacity))
+        self.breathing_points_y = np.zeros((2, breathing_points_capacity), dtype=np.float32)
+        self.breathing_points_brush = np.empty((2, breathing_points_capacity), dtype=object)
+        self.breathing_points_slot = 0
+        # frames processed so far, paces the inhalation / exhalation search
+        self.frame_count = 0
+
+    def calc_range_fft(self, frame):
+        # all antennas and chirps in one pass: remove the mean, window and FFT the zero-padded input
+        mat = frame[:num_rx_antennas]
+        windowed = self.range_fft_input[:, :, :samples_per_chirp]
+        np.subtract(mat, np.mean(mat, axis=2, keepdims=True), out=windowed)
+        windowed *= range_window
+        range_fft = sfft.fft(self.range_fft_input, axis=2)[:, :, :int(fft_size_range_profile / 2)]
+        np.sum(range_fft, axis=(0, 1), out=self.range_fft_output)
+        self.range_fft_output *= 2 / (samples_per_chirp * num_rx_antennas)
+        return self.range_fft_output
+
+    def unwrap_phase(self, wrapped_phase):
+        # np.unwrap of the new samples only, continued from the previous frame
+        unwrapped_phase = self.unwrap_output[:len(wrapped_phase)]
+        continue_unwrap(wrapped_phase, self.last_wrapped_phase, self.last_unwrapped_phase, unwrapped_phase)
+        self.last_wrapped_phase = wrapped_phase[-1]
+        self.last_unwrapped_phase = unwrapped_phase[-1]
+        return unwrapped_phase
 
     def vital_signs_fft(self, data, nFFT, data_length):
-        windowed_signal = np.multiply(data, signal.windows.blackmanharris(data_length))
-        zp2 = np.zeros(nFFT, dtype=np.complex128)
-        zp2[:data_length] = windowed_signal
-        fft_result = 1.0 / nFFT * np.abs(np.fft.fft(zp2)) + epsilon_value
-        return fft_result
+        zp2 = self.fft_scratch_complex
+        np.multiply(data, vital_signs_window, out=zp2[:data_length])
+        return 1.0 / nFFT * np.abs(sfft.fft(zp2, nFFT, workers=fft_workers)) + epsilon_value
+
+    def real_vital_signs_fft(self, unwrapped_phase, breathing, heart, nFFT):
+        # real signals have a symmetric spectrum, only the non-negative half is computed
+        zp2 = self.fft_scratch
+        window_vital_signs(unwrapped_phase, breathing, heart, vital_signs_window, zp2)
+        return 1.0 / nFFT * np.abs(sfft.rfft(zp2, nFFT, axis=1, workers=fft_workers)) + epsilon_value
 
     def process_data(self):
         global slow_time_buffer_data, I_Q_envelop, range_fft_abs, wrapped_phase_plot, unwrapped_phase_plot, \
             filtered_breathing_plot, filtered_heart_plot, buffer_raw_I_Q_fft, phase_unwrap_fft, breathing_fft, \
             heart_fft, breathing_rate_estimation_index, heart_rate_estimation_index, \
             neulog_respiration_peak_index, neulog_pulse_peak_index, neulog_respiration_fft, neulog_pulse_fft, \
-            start_time, radar_time_stamp, range_profile_peak_index, range_profile_peak_indices, \
-            inhalation_points_x, inhalation_points_y, exhalation_points_x, exhalation_points_y
+            start_time, radar_time_stamp, range_profile_peak_index, range_profile_peak_indices, breathing_points
         counter = 0
         while True:
-            time.sleep(0.001)
-            if not data_queue.empty():
-                current_time = time.time()
-                time_passed = current_time - start_time
-                start_time = current_time
-
-                radar_time_stamp = np.roll(radar_time_stamp, -1)
-                radar_time_stamp[-1] = radar_time_stamp[-2] + time_passed
-                # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-                range_fft_antennas_buffer = self.calc_range_fft(data_queue)
-                # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-                if range_fft_antennas_buffer is not None:
-                    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-                    # slow_time_index += 1
-                    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-                    range_fft_abs = np.abs(range_fft_antennas_buffer)
-                    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-                    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-                    slow_time_buffer_data = np.roll(slow_time_buffer_data, -1)
-                    I_Q_envelop = np.roll(I_Q_envelop, -1)
-
-                    start_index_range = int(object_distance_start_range / max_range * fft_size_range_profile / 2)
-                    stop_index_range = int(object_distance_stop_range / max_range * fft_size_range_profile / 2)
-
-                    range_profile_peak_indices = np.roll(range_profile_peak_indices, -1)
-                    range_profile_peak_indices[-1] = np.argmax(
-                        range_fft_abs[start_index_range: stop_index_range]) + start_index_range
-
-                    range_profile_peak_index = int(np.mean(range_profile_peak_indices[-2 * vital_signs_sample_rate:]))
-                    if max_index_processing:
-                        slow_time_buffer_data[-1] = range_fft_antennas_buffer[range_profile_peak_index]
-                    else:
-                        slow_time_buffer_data[-1] = np.mean(
-                            range_fft_antennas_buffer[start_index_range:stop_index_range])
-
-                    I_Q_envelop[-1] = np.abs(slow_time_buffer_data[-1])
-
-                    counter += 1
-                    # if counter > processing_update_interval * vital_signs_sample_rate:
-                    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-                    # phase unwrap
-                    wrapped_phase = np.angle(slow_time_buffer_data[-counter:])
-                    wrapped_phase_plot = np.roll(wrapped_phase_plot, -counter)
-                    wrapped_phase_plot[-counter:] = wrapped_phase[-counter:]
-
-                    unwrapped_phase_plot = np.roll(unwrapped_phase_plot, -counter)
-                    unwrapped_phase_plot[-counter:] = wrapped_phase_plot[-counter:]
-
-                    unwrapped_phase = np.unwrap(unwrapped_phase_plot[-processing_data_size:])
-                    unwrapped_phase_plot[-processing_data_size:] = unwrapped_phase
-                    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-                    # filter
-                    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-                    # 改进呼吸信号滤波
-                    # 先应用带通滤波器
-                    filtered_breathing = lfilter(breathing_b, 1, unwrapped_phase_plot[-processing_data_size:])
+            try:
+                frame = data_queue.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            current_time = time.time()
+            time_passed = current_time - start_time
+            start_time = current_time
+
+            radar_time_stamp.push(radar_time_stamp.last() + time_passed)
+            # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+            range_fft_antennas_buffer = self.calc_range_fft(frame)
+            # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+            # slow_time_index += 1
+            # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+            range_fft_abs = np.abs(range_fft_antennas_buffer)
+            # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+            # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+            range_profile_peak_indices.push(np.argmax(
+                range_fft_abs[start_index_range: stop_index_range]) + start_index_range)
+
+            range_profile_peak_index = int(
+                np.mean(range_profile_peak_indices.recent(range_peak_average_size)))
+            if max_index_processing:
+                slow_time_buffer_data.push(range_fft_antennas_buffer[range_profile_peak_index])
+            else:
+                slow_time_buffer_data.push(np.mean(
+                    range_fft_antennas_buffer[start_index_range:stop_index_range]))
+
+            I_Q_envelop.push(np.abs(slow_time_buffer_data.last()))
+
+            counter += 1
+            self.frame_count += 1
+            # if counter > processing_update_interval * vital_signs_sample_rate:
+            # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+            # phase unwrap
+            # the angle is taken in float64, so a real negative sample gives exactly pi (see continue_unwrap)
+            wrapped_phase = np.angle(slow_time_buffer_data.recent(counter).astype(np.complex128))
+            wrapped_phase_plot.extend(wrapped_phase)
+            wrapped_phase_plot_deg.extend(wrapped_phase * rad_to_deg)
+
+            unwrapped_phase = self.unwrap_phase(wrapped_phase)
+            unwrapped_phase_plot.extend(unwrapped_phase)
+            unwrapped_phase_plot_deg.extend(unwrapped_phase * rad_to_deg)
+            # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+            # filter
+            # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+            # 改进呼吸信号滤波
+            # 先应用带通滤波器
+            # an FIR output only depends on the last filter_order inputs, so only the new samples are filtered
+            breathing_new = self.breathing_filter_output[:counter]
+            fir_filter_valid(unwrapped_phase_plot.recent(filter_order + counter - 1), breathing_b, breathing_new)
+            breathing_bandpass.extend(breathing_new)
+            # 应用Savitzky-Golay滤波器进行平滑处理, 再应用均值滤波进一步平滑
+            filtered_breathing = breathing_smoothing[-counter:] @ breathing_bandpass.recent(breathing_savgol_length)
+            filtered_breathing_plot.extend(filtered_breathing)
+            filtered_breathing_plot_deg.extend(filtered_breathing * rad_to_deg)
+
+            hp_input = unwrapped_phase_plot.recent(processing_data_size)
+            cycle2 = self.hp_filter_output
+            hp_filter_cycle(hp_input, hp_filter_cholesky, cycle2)
+            filtered_heart = self.heart_filter_output[:counter]
+            fir_filter_valid(cycle2[-(filter_order + counter - 1):], heart_b, filtered_heart)
+            filtered_heart_plot.extend(filtered_heart)
+            filtered_heart_plot_deg.extend(filtered_heart * rad_to_deg)
+            # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+            # Vital Signs FFT
+            # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+            buffer_raw_I_Q_fft = self.vital_signs_fft(slow_time_buffer_data.recent(processing_data_size),
+                                                      fft_size_vital_signs,
+                                                      processing_data_size)
+            phase_unwrap_fft, breathing_fft, heart_fft = self.real_vital_signs_fft(
+                unwrapped_phase_plot.recent(processing_data_size),
+                filtered_breathing_plot.recent(processing_data_size),
+                filtered_heart_plot.recent(processing_data_size),
+                fft_size_vital_signs)
+            # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+            # Breathing and heart rate estimation
+            # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+            # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+            # best_peak returns the fractional peak bin, 0 when the band has no peak
+            breathing_rate_estimation_index.push_or_repeat(
+                best_peak(breathing_fft, index_start_breathing, index_end_breathing) or None)
+            # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+            heart_rate_estimation_index.push_or_repeat(best_peak(heart_fft, index_start_heart, index_end_heart) or None)
+
+            # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+            # Identify inhalation and exhalation phases in breathing signal
+            # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+            if self.frame_count % breathing_points_interval == 0 and ENABLE_BREATHING_VISUALIZATION:
+                # 获取最近的呼吸数据
+                recent_time = radar_time_stamp.recent(breathing_points_window_size)
+                recent_breathing = filtered_breathing_plot.recent(breathing_points_window_size)
+                
+                if len(recent_breathing) > 0:
+                    # 应用更强的滤波来检测峰值
+                    
                     # 应用Savitzky-Golay滤波器进行平滑处理
-                    window_length = min(51, processing_data_size - 2)  # 确保窗口长度是奇数且小于数据长度
+                    window_length = min(31, len(recent_breathing) - 2)  # 确保窗口长度是奇数且小于数据长度
                     if window_length % 2 == 0:
                         window_length -= 1
                     if window_length > 5:  # 确保有足够的数据点进行滤波
-                        filtered_breathing = signal.savgol_filter(filtered_breathing, window_length, 3)
-                    # 再应用均值滤波进一步平滑
-                    filtered_breathing = uniform_filter1d(filtered_breathing, size=5)
-                    filtered_breathing_plot = np.roll(filtered_breathing_plot, -counter)
-                    filtered_breathing_plot[-counter:] = filtered_breathing[-counter:]
-
-                    cycle2, trend = sm.tsa.filters.hpfilter(unwrapped_phase_plot[-processing_data_size:],
-                                                            3 * vital_signs_sample_rate)
-                    filtered_heart = lfilter(heart_b, 1, cycle2)
-                    filtered_heart_plot = np.roll(filtered_heart_plot, -counter)
-                    filtered_heart_plot[-counter:] = filtered_heart[-counter:]
-                    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-                    # Vital Signs FFT
-                    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-                    buffer_raw_I_Q_fft = self.vital_signs_fft(slow_time_buffer_data[-processing_data_size:],
-                                                              fft_size_vital_signs,
-                                                              processing_data_size)
-                    phase_unwrap_fft = self.vital_signs_fft(unwrapped_phase_plot[-processing_data_size:],
-                                                            fft_size_vital_signs,
-                                                            processing_data_size)
-                    breathing_fft = self.vital_signs_fft(filtered_breathing_plot[-processing_data_size:],
-                                                         fft_size_vital_signs,
-                                                         processing_data_size)
-                    heart_fft = self.vital_signs_fft(filtered_heart_plot[-processing_data_size:], fft_size_vital_signs,
-                                                     processing_data_size)
-                    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-                    # Breathing and heart rate estimation
-                    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-                    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-                    breathing_rate_estimation_index = np.roll(breathing_rate_estimation_index, -1)
-                    breathing_rate_estimation_index[-1] = breathing_rate_estimation_index[-2]
-                    rate_index_br = self.find_signal_peaks(breathing_fft, index_start_breathing,
-                                                           index_end_breathing, peak_finding_distance)
-                    if rate_index_br != 0:
-                        breathing_rate_estimation_index[-1] = rate_index_br
-                    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-                    heart_rate_estimation_index = np.roll(heart_rate_estimation_index, -1)
-                    heart_rate_estimation_index[-1] = heart_rate_estimation_index[-2]
-                    rate_index_hr = self.find_signal_peaks(heart_fft, index_start_heart,
-                                                           index_end_heart, peak_finding_distance)
-                    if rate_index_hr != 0:
-                        heart_rate_estimation_index[-1] = rate_index_hr
-
-                    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-                    # Identify inhalation and exhalation phases in breathing signal
-                    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-                    if counter % 5 == 0 and ENABLE_BREATHING_VISUALIZATION:
-                        # 获取最近的呼吸数据
-                        recent_time = radar_time_stamp[-int(10 * vital_signs_sample_rate):]
-                        recent_breathing = filtered_breathing_plot[-int(10 * vital_signs_sample_rate):]
-                        
-                        if len(recent_breathing) > 0:
-                            # 应用更强的滤波来检测峰值
-                            fs = vital_signs_sample_rate  # 采样率
-                            
-                            # 应用Savitzky-Golay滤波器进行平滑处理
-                            window_length = min(31, len(recent_breathing) - 2)  # 确保窗口长度是奇数且小于数据长度
-                            if window_length % 2 == 0:
-                                window_length -= 1
-                            if window_length > 5:  # 确保有足够的数据点进行滤波
-                                smoothed_breathing = signal.savgol_filter(recent_breathing, window_length, 3)
-                            else:
-                                smoothed_breathing = recent_breathing
-                            
-                            # 应用中值滤波去除异常值
-                            smoothed_breathing = signal.medfilt(smoothed_breathing, kernel_size=5)
-                            
-                            # 找到峰值和谷值，增加最小高度和距离要求
-                            # 计算信号振幅以设置动态阈值
-                            signal_amplitude = np.percentile(smoothed_breathing, 95) - np.percentile(smoothed_breathing, 5)
-                            min_height = signal_amplitude * 0.2  # 最小高度为振幅的20%
-                            
-                            peaks, _ = find_peaks(smoothed_breathing, 
-                                                 distance=int(fs/2),  # 最小距离（基于呼吸频率）
-                                                 height=min_height,   # 最小高度要求
-                                                 prominence=min_height * 0.5)  # 要求峰值突出性
-                            
-                            valleys, _ = find_peaks(-smoothed_breathing, 
-                                                  distance=int(fs/2),
-                                                  height=min_height,
-                                                  prominence=min_height * 0.5)
-                            
-                            # 清除之前的点
-                            inhalation_points_x = []
-                            inhalation_points_y = []
-                            exhalation_points_x = []
-                            exhalation_points_y = []
-                            
-                            # 添加峰值点（吸气）
-                            for idx in peaks:
-                                if idx < len(recent_time):
-                                    inhalation_points_x.append(recent_time[idx])
-                                    inhalation_points_y.append(recent_breathing[idx])  # 使用原始信号进行显示
-                            
-                            # 添加谷值点（呼气）
-                            for idx in valleys:
-                                if idx < len(recent_time):
-                                    exhalation_points_x.append(recent_time[idx])
-                                    exhalation_points_y.append(recent_breathing[idx])  # 使用原始信号进行显示
+                        smoothed_breathing = signal.savgol_filter(recent_breathing, window_length, 3)
+                    else:
+                        smoothed_breathing = recent_breathing
+                    
+                    # 应用中值滤波去除异常值
+                    smoothed_breathing = signal.medfilt(smoothed_breathing, kernel_size=5)
+                    
+                    # 找到峰值和谷值，增加最小高度和距离要求
+                    # 计算信号振幅以设置动态阈值
+                    signal_amplitude = np.percentile(smoothed_breathing, 95) - np.percentile(smoothed_breathing, 5)
+                    min_height = signal_amplitude * 0.2  # 最小高度为振幅的20%
                     
-                    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-                    counter = 0
+                    peaks, _ = find_peaks(smoothed_breathing, 
+                                         distance=breathing_points_distance,
+                                         height=min_height,   # 最小高度要求
+                                         prominence=min_height * 0.5)  # 要求峰值突出性
+                    
+                    valleys, _ = find_peaks(-smoothed_breathing, 
+                                          distance=breathing_points_distance,
+                                          height=min_height,
+                                          prominence=min_height * 0.5)
+                    
+                    # 替换之前的点，y 值直接转换为显示用的角度
+                    peaks = peaks[peaks < len(recent_time)]
+                    valleys = valleys[valleys < len(recent_time)]
+                    # 峰值点（吸气）红色, 谷值点（呼气）蓝色, drawn by one scatter item with a brush per point.
+                    # x, y and brushes are replaced together so the plot never sees arrays of different lengths
+                    points = np.concatenate((peaks, valleys))
+                    slot = self.breathing_points_slot
+                    points_x = self.breathing_points_x[slot, :len(points)]
+                    points_y = self.breathing_points_y[slot, :len(points)]
+                    points_brush = self.breathing_points_brush[slot, :len(points)]
+                    np.take(recent_time, points, out=points_x)
+                    np.take(recent_breathing, points, out=points_y)
+                    points_y *= rad_to_deg  # 使用原始信号进行显示
+                    points_brush[:len(peaks)] = breathing_point_brushes[0]
+                    points_brush[len(peaks):] = breathing_point_brushes[1]
+                    breathing_points = (points_x, points_y, points_brush)
+                    self.breathing_points_slot = 1 - slot
+            
+            # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+            new_frame_ready.set()
+            new_plot_data.set()
+            counter = 0
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+def shift_spectrum(spectrum, out):
+    # np.fft.fftshift for an even length, written into a preallocated buffer
+    half = len(spectrum) // 2
+    out[:half] = spectrum[half:]
+    out[half:] = spectrum[:half]
+    return out
+
+
+def shift_real_spectrum(half_spectrum, out):
+    # equivalent of np.fft.fftshift on the full spectrum of a real signal, rebuilt by mirroring the rfft half
+    half = len(half_spectrum) - 1
+    out[:half] = half_spectrum[:0:-1]
+    out[half:] = half_spectrum[:-1]
+    return out
+
+
 def update_plots():
     global breathing_rate_estimation_value, heart_rate_estimation_value, \
-        breathing_rate_estimation_time_stamp, heart_rate_estimation_time_stamp, \
-        inhalation_points_x, inhalation_points_y, exhalation_points_x, exhalation_points_y
+        breathing_rate_estimation_time_stamp, heart_rate_estimation_time_stamp
+    if not new_plot_data.is_set():
+        return
+    new_plot_data.clear()
+    # buffers filled by the processing thread are copied so a paint never sees them mid-update, into persistent
+    # snapshot arrays rather than fresh ones
+    time_axis = time_axis_snapshot
+    np.copyto(time_axis, radar_time_stamp.recent())
     # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
     # range profile plot
     if ENABLE_RANGE_PROFILE_PLOT:
@@ -350,73 +509,124 @@ def update_plots():
     # phase unwrap plot
     if ENABLE_PHASE_UNWRAP_PLOT:
         # for k in range(num_rx_antennas):
-        phase_unwrap_plots[0][0].setData(radar_time_stamp, np.real(slow_time_buffer_data))
-        phase_unwrap_plots[1][0].setData(radar_time_stamp, np.imag(slow_time_buffer_data))
-        phase_unwrap_plots[2][0].setData(radar_time_stamp, I_Q_envelop)
-        phase_unwrap_plots[3][0].setData(radar_time_stamp, wrapped_phase_plot * 180 / np.pi)
-        phase_unwrap_plots[4][0].setData(radar_time_stamp, unwrapped_phase_plot * 180 / np.pi)
-        phase_unwrap_plots[5][0].setData(radar_time_stamp, filtered_breathing_plot * 180 / np.pi)
-        phase_unwrap_plots[6][0].setData(radar_time_stamp, filtered_heart_plot * 180 / np.pi)
+        np.copyto(slow_time_snapshot, slow_time_buffer_data.recent())
+        np.copyto(plot_snapshots[0], I_Q_envelop.recent())
+        np.copyto(plot_snapshots[1], wrapped_phase_plot_deg.recent())
+        np.copyto(plot_snapshots[2], unwrapped_phase_plot_deg.recent())
+        np.copyto(plot_snapshots[3], filtered_breathing_plot_deg.recent())
+        np.copyto(plot_snapshots[4], filtered_heart_plot_deg.recent())
+        phase_unwrap_plots[0][0].setData(time_axis, slow_time_snapshot.real)
+        phase_unwrap_plots[1][0].setData(time_axis, slow_time_snapshot.imag)
+        phase_unwrap_plots[2][0].setData(time_axis, plot_snapshots[0])
+        phase_unwrap_plots[3][0].setData(time_axis, plot_snapshots[1])
+        phase_unwrap_plots[4][0].setData(time_axis, plot_snapshots[2])
+        phase_unwrap_plots[5][0].setData(time_axis, plot_snapshots[3])
+        phase_unwrap_plots[6][0].setData(time_axis, plot_snapshots[4])
 
     # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
     # breathing fft plot
     if ENABLE_VITALSIGNS_SPECTRUM:
         # for k in range(num_rx_antennas):
-        vital_signs_plots[0][0].setData(x_axis_vital_signs_spectrum, np.fft.fftshift(buffer_raw_I_Q_fft))
-        vital_signs_plots[1][0].setData(x_axis_vital_signs_spectrum, np.fft.fftshift(phase_unwrap_fft))
-        vital_signs_plots[2][0].setData(x_axis_vital_signs_spectrum, np.fft.fftshift(breathing_fft))
-        vital_signs_plots[3][0].setData(x_axis_vital_signs_spectrum, np.fft.fftshift(heart_fft))
-        if breathing_rate_estimation_index[estimation_index_breathing] > 0:
-            xb = x_axis_vital_signs_spectrum[
-                int(fft_size_vital_signs / 2 + np.mean(breathing_rate_estimation_index[estimation_index_breathing:]))]
-            yb = breathing_fft[int(np.mean(breathing_rate_estimation_index[estimation_index_breathing:]))]
+        vital_signs_plots[0][0].setData(x_axis_vital_signs_spectrum,
+                                        shift_spectrum(buffer_raw_I_Q_fft, shifted_spectra[0]))
+        vital_signs_plots[1][0].setData(x_axis_vital_signs_spectrum,
+                                        shift_real_spectrum(phase_unwrap_fft, shifted_spectra[1]))
+        vital_signs_plots[2][0].setData(x_axis_vital_signs_spectrum,
+                                        shift_real_spectrum(breathing_fft, shifted_spectra[2]))
+        vital_signs_plots[3][0].setData(x_axis_vital_signs_spectrum,
+                                        shift_real_spectrum(heart_fft, shifted_spectra[3]))
+        breathing_indices = breathing_rate_estimation_index.recent().copy()
+        heart_indices = heart_rate_estimation_index.recent().copy()
+        if breathing_indices[estimation_index_breathing] > 0:
+            breathing_index = np.mean(breathing_indices[estimation_slice_breathing])
+            xb = x_axis_vital_signs_spectrum[int(fft_size_vital_signs / 2 + breathing_index)]
+            yb = breathing_fft[int(breathing_index)]
             vital_signs_plots[4][0].setData([xb], [yb])
-        if heart_rate_estimation_index[estimation_index_heart] > 0:
-            xh = x_axis_vital_signs_spectrum[
-                int(fft_size_vital_signs / 2 + np.mean(heart_rate_estimation_index[estimation_index_heart:]))]
-            yh = heart_fft[int(np.mean(heart_rate_estimation_index[estimation_index_heart:]))]
+        if heart_indices[estimation_index_heart] > 0:
+            heart_index = np.mean(heart_indices[estimation_slice_heart])
+            xh = x_axis_vital_signs_spectrum[int(fft_size_vital_signs / 2 + heart_index)]
+            yh = heart_fft[int(heart_index)]
             vital_signs_plots[5][0].setData([xh], [yh])
     # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
     # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
     if ENABLE_ESTIMATION_PLOT:
-        global breathing_rate_estimation_value, heart_rate_estimation_value
-        if breathing_rate_estimation_index[estimation_index_breathing] > 0:
-            breathing_rate_estimation_value = np.roll(breathing_rate_estimation_value, -1)
-            xb = x_axis_vital_signs_spectrum[
-                     round(fft_size_vital_signs / 2 + np.mean(
-                         breathing_rate_estimation_index[estimation_index_breathing:]))] * 60
-            breathing_rate_estimation_value[-1] = round(xb) - 2
-            estimation_plots[0][0].setData(radar_time_stamp, breathing_rate_estimation_value)
-
-        if heart_rate_estimation_index[estimation_index_heart] > 0:
-            heart_rate_estimation_value = np.roll(heart_rate_estimation_value, -1)
-            xh = x_axis_vital_signs_spectrum[
-                     round(
-                         fft_size_vital_signs / 2 + np.mean(heart_rate_estimation_index[estimation_index_heart:]))] * 60
-            heart_rate_estimation_value[-1] = round(xh) - 2
-            estimation_plots[1][0].setData(radar_time_stamp, heart_rate_estimation_value)
-        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+        np.copyto(plot_snapshots[5], breathing_rate_estimation_value.recent())
+        np.copyto(plot_snapshots[6], heart_rate_estimation_value.recent())
+        estimation_plots[0][0].setData(time_axis, plot_snapshots[5])
+        estimation_plots[1][0].setData(time_axis, plot_snapshots[6])
     # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
     # Breathing visualization plot
     if ENABLE_BREATHING_VISUALIZATION:
         # Plot the breathing signal
-        breathing_viz_plots[0][0].setData(radar_time_stamp, filtered_breathing_plot * 180 / np.pi)
+        np.copyto(plot_snapshots[7], filtered_breathing_plot_deg.recent())
+        breathing_viz_plots[0][0].setData(time_axis, plot_snapshots[7])
         
         # Plot inhalation and exhalation points
-        if len(inhalation_points_x) > 0:
-            breathing_viz_plots[1][0].setData(inhalation_points_x, 
-                                             [y * 180 / np.pi for y in inhalation_points_y])
-        
-        if len(exhalation_points_x) > 0:
-            breathing_viz_plots[2][0].setData(exhalation_points_x, 
-                                             [y * 180 / np.pi for y in exhalation_points_y])
-        
+        points_x, points_y, points_brush = breathing_points
+        if len(points_x) > 0:
+            breathing_viz_plots[1][0].setData(x=points_x, y=points_y, brush=points_brush)
+
+
+def send_osc(messages):
+    # all (address, value) pairs of one update in a single OSC bundle, i.e. one UDP datagram.
+    # Returns False when the values equal the last bundle and nothing was sent
+    global last_osc_messages
+    if messages == last_osc_messages:
+        return False
+    last_osc_messages = messages
+    bundle = osc_bundle_builder.OscBundleBuilder(osc_bundle_builder.IMMEDIATELY)
+    for address, value in messages:
+        message = osc_message_builder.OscMessageBuilder(address=address)
+        message.add_arg(value)
+        bundle.add_content(message.build())
+    osc_client.send(bundle.build())
+    return True
+
+
+def log_osc(breathing_hz, heart_hz, ratio, presence):
+    if ENABLE_OSC_LOGGING:
+        try:
+            osc_log_queue.put_nowait((breathing_hz, heart_hz, ratio, presence))
+        except queue.Full:
+            pass
+
+
+def print_osc_log():
+    # terminal output of the OSC values, kept off the GUI thread
+    while True:
+        breathing_hz, heart_hz, ratio, presence = osc_log_queue.get()
+        print(f"Sent OSC: xhz={breathing_hz:.3f}, yhz={heart_hz:.3f}, xratio={ratio:.3f}, yratio={ratio:.3f}, "
+              f"presence={presence}")
+
+
+def update_outputs():
+    # rate estimates, breathing circle and OSC messages, refreshed once per processed frame
+    if not new_frame_ready.is_set():
+        return
+    new_frame_ready.clear()
+    if ENABLE_ESTIMATION_PLOT:
+        breathing_indices = breathing_rate_estimation_index.recent().copy()
+        heart_indices = heart_rate_estimation_index.recent().copy()
+        # the mean peak bin is fractional (sub-bin peak refinement), it is converted to BPM without snapping it
+        # back to a bin
+        if breathing_indices[estimation_index_breathing] > 0:
+            xb = np.mean(breathing_indices[estimation_slice_breathing]) * bin_to_bpm
+            breathing_rate_estimation_value.push(xb + rate_offset_bpm)
+            breathing_rate_mean.push(xb + rate_offset_bpm)
+
+        if heart_indices[estimation_index_heart] > 0:
+            xh = np.mean(heart_indices[estimation_slice_heart]) * bin_to_bpm
+            heart_rate_estimation_value.push(xh + rate_offset_bpm)
+            heart_rate_mean.push(xh + rate_offset_bpm)
+        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    if ENABLE_BREATHING_VISUALIZATION:
         # Update the circle visualization and send OSC data
         # Get the most recent breathing value
         if len(filtered_breathing_plot) > 0:
             # Normalize the breathing signal to a reasonable range for the circle size
             # We'll use the last 5 seconds of data to determine the min/max for normalization
-            recent_breathing = filtered_breathing_plot[-int(5 * vital_signs_sample_rate):]
+            recent_breathing = filtered_breathing_plot.recent(breathing_circle_window_size).copy()
             if len(recent_breathing) > 0:
                 # Check if there's a valid breathing signal (person present)
                 # Calculate signal variance to detect if there's meaningful breathing activity
@@ -424,14 +634,17 @@ def update_plots():
                 min_variance_threshold = 0.0001  # Adjust this threshold based on your system
                 
                 # Check if I_Q_envelop (signal strength) is strong enough
-                recent_envelope = I_Q_envelop[-int(5 * vital_signs_sample_rate):]
+                recent_envelope = I_Q_envelop.recent(breathing_circle_window_size).copy()
                 mean_envelope = np.mean(recent_envelope)
                 min_envelope_threshold = 0.001  # Adjust based on your system
                 
                 # Only update circle if signal quality is good
                 if signal_variance > min_variance_threshold and mean_envelope > min_envelope_threshold:
+                    # averaged breathing rate, used for both the OSC output and the label
+                    avg_rate = breathing_rate_mean.value
+
                     # Get the current breathing value (most recent)
-                    current_breathing = filtered_breathing_plot[-1]
+                    current_breathing = recent_breathing[-1]
                     
                     # Normalize to remove distance-related DC offset
                     # Use a moving average of the signal as the baseline
@@ -448,7 +661,7 @@ def update_plots():
                     # Map circle size to OSC range (0.1 to 1.0)
                     # 30 maps to 0.1, 100 maps to 1.0
                     osc_value = 0.1 + 0.9 * (circle_size - 30) / 70
-                    osc_value = max(0.1, min(1.0, osc_value))  # Ensure it's within range
+                    osc_value = float(max(0.1, min(1.0, osc_value)))  # Ensure it's within range (plain float for OSC)
                     
                     # Determine if we're in inhalation or exhalation phase by checking the derivative
                     if len(recent_breathing) > 2:
@@ -462,55 +675,49 @@ def update_plots():
                             
                             # Get breathing rate in Hz
                             breathing_hz = 0
-                            if len(breathing_rate_estimation_value) > 0:
-                                avg_rate = np.mean(breathing_rate_estimation_value[-int(estimation_time * vital_signs_sample_rate):])
-                                if not np.isnan(avg_rate) and avg_rate > 0:
-                                    breathing_hz = avg_rate / 60.0  # Convert BPM to Hz
+                            if not np.isnan(avg_rate) and avg_rate > 0:
+                                breathing_hz = avg_rate / 60.0  # Convert BPM to Hz
                             
                             # Get heart rate in Hz
                             heart_hz = 0
-                            if len(heart_rate_estimation_value) > 0:
-                                avg_heart_rate = np.mean(heart_rate_estimation_value[-int(estimation_time * vital_signs_sample_rate):])
-                                if not np.isnan(avg_heart_rate) and avg_heart_rate > 0:
-                                    heart_hz = avg_heart_rate / 60.0  # Convert BPM to Hz
+                            avg_heart_rate = heart_rate_mean.value
+                            if not np.isnan(avg_heart_rate) and avg_heart_rate > 0:
+                                heart_hz = avg_heart_rate / 60.0  # Convert BPM to Hz
                             
                             # Send data via OSC
-                            osc_client.send_message("/xhz", breathing_hz)
-                            osc_client.send_message("/yhz", heart_hz/2)
-                            osc_client.send_message("/xratio", osc_value)
-                            osc_client.send_message("/yratio", osc_value)
-                            osc_client.send_message("/presence", presence)
-                            
-                            # Print the values being sent
-                            print(f"Sent OSC: xhz={breathing_hz:.3f}, yhz={heart_hz:.3f}, xratio={osc_value:.3f}, yratio={osc_value:.3f}, presence={presence}")
+                            if send_osc([("/xhz", breathing_hz),
+                                         ("/yhz", heart_hz/2),
+                                         ("/xratio", osc_value),
+                                         ("/yratio", osc_value),
+                                         ("/presence", presence)]):
+                                log_osc(breathing_hz, heart_hz, osc_value, presence)
                     else:
                         circle_color = 'g'  # Default to green
                     
                     # Update the circle
-                    breathing_viz_plots[3][0].setData([0], [0], size=[circle_size], 
-                                                     brush=pg.mkBrush(circle_color), 
+                    breathing_viz_plots[2][0].setData([0], [0], size=[circle_size], 
+                                                     brush=circle_brushes[circle_color], 
                                                      pen=None)
                     
                     # Calculate and display breathing rate
-                    if len(breathing_rate_estimation_value) > 0:
-                        avg_rate = np.mean(breathing_rate_estimation_value[-int(estimation_time * vital_signs_sample_rate):])
-                        if not np.isnan(avg_rate) and avg_rate > 0:
-                            breathing_viz_plots[4][0].setText(f"Breathing Rate: {avg_rate:.1f} BPM")
+                    if not np.isnan(avg_rate) and avg_rate > 0:
+                        breathing_viz_plots[3][0].setText(f"Breathing Rate: {avg_rate:.1f} BPM")
                 else:
                     # No valid breathing signal detected - show a gray circle with fixed size
-                    breathing_viz_plots[3][0].setData([0], [0], size=[40], 
-                                                     brush=pg.mkBrush('gray'), 
+                    breathing_viz_plots[2][0].setData([0], [0], size=[40], 
+                                                     brush=circle_brushes['gray'], 
                                                      pen=None)
-                    breathing_viz_plots[4][0].setText("No person detected")
+                    breathing_viz_plots[3][0].setText("No person detected")
                     
                     # Send presence = 0 via OSC when no person is detected
                     if ENABLE_OSC_OUTPUT and osc_client:
-                        osc_client.send_message("/presence", 0)
-                        osc_client.send_message("/xratio", 0.1)
-                        osc_client.send_message("/yratio", 0.1)
-                        osc_client.send_message("/xhz", 0)
-                        osc_client.send_message("/yhz", 0)
-                        print("Sent OSC: xhz=0.000, yhz=0.000, xratio=0.100, yratio=0.100, presence=0")
+                        if send_osc([("/presence", 0),
+                                     ("/xratio", 0.1),
+                                     ("/yratio", 0.1),
+                                     ("/xhz", 0),
+                                     ("/yhz", 0)]):
+                            log_osc(0, 0, 0.1, 0)
+
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -520,6 +727,12 @@ def update_plots():
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 app = QApplication([])
+# must be set before the figures are created; curves use the OpenGL line path when PyOpenGL is installed
+pg.setConfigOptions(useOpenGL=ENABLE_OPENGL, enableExperimental=ENABLE_OPENGL, antialias=False)
+# breathing circle brushes: inhale, exhale, no derivative yet, nobody detected
+circle_brushes = {color: pg.mkBrush(color) for color in ('r', 'b', 'g', 'gray')}
+# inhalation (red) and exhalation (blue) point brushes
+breathing_point_brushes = np.array([circle_brushes['r'], circle_brushes['b']], dtype=object)
 
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -560,6 +773,8 @@ def generate_range_profile_plot():
     plot_objects[0][0].setVisible(True)
     linear_region_range_profle = pg.LinearRegionItem([object_distance_start_range, object_distance_stop_range],
                                                      brush=(255, 255, 0, 20))  # Yellow color with opacity
+    # the region only changes while dragged, its rendering is cached between the curve updates around it
+    linear_region_range_profle.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
     plot.addItem(linear_region_range_profle)
 
     def region_changed():
@@ -567,9 +782,15 @@ def generate_range_profile_plot():
         region = linear_region_range_profle.getRegion()
         object_distance_start_range = region[0]
         object_distance_stop_range = region[1]
+        update_range_indices()
         # print("Linear Region Position:", region)
 
-    linear_region_range_profle.sigRegionChanged.connect(region_changed)
+    # sigRegionChanged fires on every mouse move while dragging, the restarted single shot timer coalesces them
+    region_timer = QTimer(plot)
+    region_timer.setSingleShot(True)
+    region_timer.setInterval(region_update_delay)
+    region_timer.timeout.connect(region_changed)
+    linear_region_range_profle.sigRegionChanged.connect(lambda: region_timer.start())
 
     return plot, plot_objects
 
@@ -590,6 +811,9 @@ def generate_phase_unwrap_plot():
     plot.setLabel('bottom', 'Time [s]')
     plot.setLabel('left', 'Unwrapped Phase [deg.]')
     plot.addLegend()
+    # draw only the visible part of the curves, reduced to about one point per pixel
+    plot.setDownsampling(auto=True, mode='peak')
+    plot.setClipToView(True)
     plots = [
         ('orange', 'Slow-Time Signal [I]'),
         ('beige', 'Slow-Time Signal [Q]'),
@@ -660,6 +884,7 @@ def generate_vitalsigns_spectrum_plot():
     plot_objects[3][0].setVisible(True)
 
     linear_region_breathing = pg.LinearRegionItem([low_breathing, high_breathing], brush=(255, 255, 0, 20))
+    linear_region_breathing.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
     plot.addItem(linear_region_breathing, 'Breathing Linear Region')
 
     def linear_region_breathing_changed():
@@ -671,12 +896,18 @@ def generate_vitalsigns_spectrum_plot():
             high_breathing = region[1]
             breathing_b = firwin(filter_order, [low_breathing / nyquist_freq, high_breathing / nyquist_freq],
                                  pass_zero=False)
-            index_start_breathing = int(low_breathing / vital_signs_sample_rate * fft_size_vital_signs)
-            index_end_breathing = int(high_breathing / vital_signs_sample_rate * fft_size_vital_signs)
+            index_start_breathing = int(low_breathing * hz_to_bin)
+            index_end_breathing = int(high_breathing * hz_to_bin)
 
-    linear_region_breathing.sigRegionChanged.connect(linear_region_breathing_changed)
+    # the band-pass taps are redesigned once the region has settled, not on every mouse move of a drag
+    breathing_region_timer = QTimer(plot)
+    breathing_region_timer.setSingleShot(True)
+    breathing_region_timer.setInterval(region_update_delay)
+    breathing_region_timer.timeout.connect(linear_region_breathing_changed)
+    linear_region_breathing.sigRegionChanged.connect(lambda: breathing_region_timer.start())
 
     linear_region_heart = pg.LinearRegionItem([low_heart, high_heart], brush=(255, 255, 0, 20))
+    linear_region_heart.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
     plot.addItem(linear_region_heart)
 
     def linear_region_heart_changed():
@@ -687,10 +918,14 @@ def generate_vitalsigns_spectrum_plot():
             low_heart = region[0]
             high_heart = region[1]
             heart_b = firwin(filter_order, [low_heart / nyquist_freq, high_heart / nyquist_freq], pass_zero=False)
-            index_start_heart = int(low_heart / vital_signs_sample_rate * fft_size_vital_signs)
-            index_end_heart = int(high_heart / vital_signs_sample_rate * fft_size_vital_signs)
+            index_start_heart = int(low_heart * hz_to_bin)
+            index_end_heart = int(high_heart * hz_to_bin)
 
-    linear_region_heart.sigRegionChanged.connect(linear_region_heart_changed)
+    heart_region_timer = QTimer(plot)
+    heart_region_timer.setSingleShot(True)
+    heart_region_timer.setInterval(region_update_delay)
+    heart_region_timer.timeout.connect(linear_region_heart_changed)
+    linear_region_heart.sigRegionChanged.connect(lambda: heart_region_timer.start())
     plot.setXRange(low_breathing, high_heart + 0.5)
     return plot, plot_objects
 
@@ -711,6 +946,8 @@ def generate_estimation_plot():
     plot.setLabel('bottom', 'Time [s]')
     plot.setLabel('left', 'Rate [b.p.m.]')
     plot.addLegend()
+    plot.setDownsampling(auto=True, mode='peak')
+    plot.setClipToView(True)
     plots = [
         ('g', 'Breathing'),
         ('c', 'Heart')
@@ -756,6 +993,8 @@ def generate_breathing_visualization_plot():
     signal_plot.setLabel('bottom', 'Time [s]')
     signal_plot.setLabel('left', 'Amplitude')
     signal_plot.setTitle('Breathing Signal')
+    signal_plot.setDownsampling(auto=True, mode='peak')
+    signal_plot.setClipToView(True)
     
     # Second plot for the circle visualization
     circle_plot = layout_widget.addPlot(row=1, col=0)
@@ -771,8 +1010,13 @@ def generate_breathing_visualization_plot():
     
     # Set up the breathing signal plot
     breathing_signal = signal_plot.plot(pen={'color': 'g', 'width': 2})
-    inhalation_points = signal_plot.plot(pen=None, symbolPen='r', symbolBrush='r', symbol='o', symbolSize=10)
-    exhalation_points = signal_plot.plot(pen=None, symbolPen='b', symbolBrush='b', symbol='o', symbolSize=10)
+    # inhalation and exhalation points share one scatter item, colored per point
+    breathing_points_item = pg.ScatterPlotItem(pen=None, symbol='o', size=10)
+    signal_plot.addItem(breathing_points_item)
+    # the circle and the rate text repaint this figure on every frame, the points only change with the slower
+    # plot timer, so their rendering is cached in between. The signal curve is not cached: it scrolls with the
+    # time axis on every plot tick and a cached item would be drawn through a raster pixmap instead of OpenGL
+    breathing_points_item.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
     
     # Create a text item to display breathing rate
     breathing_rate_text = pg.TextItem(text="", color=(255, 255, 255))
@@ -781,8 +1025,7 @@ def generate_breathing_visualization_plot():
     
     plot_objects = [
         [breathing_signal],
-        [inhalation_points],
-        [exhalation_points],
+        [breathing_points_item],
         [circle],
         [breathing_rate_text]
     ]
@@ -798,8 +1041,11 @@ if ENABLE_BREATHING_VISUALIZATION:
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 timer = QTimer()
-timer.timeout.connect(update_plots)
-timer.start(figure_update_time)  # Update the plots every 100 milliseconds
+timer.timeout.connect(update_outputs)
+timer.start(figure_update_time)
+plot_timer = QTimer()
+plot_timer.timeout.connect(update_plots)
+plot_timer.start(plot_update_time)
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # main
@@ -860,34 +1106,49 @@ if __name__ == "__main__":
         print("range resolution = ", range_res * 2)
         max_range = range_res * samples_per_chirp / 2
         print("maximum range = ", max_range)
+        update_range_indices()
         min_range = 0.15
         min_range_index = int(min_range * fft_size_range_profile / 2)
         print('vital_signs_sample_rate = ', vital_signs_sample_rate, 'Hz')
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-        range_fft_abs = np.zeros(int(fft_size_range_profile / 2))
-        radar_time_stamp = np.zeros(buffer_data_size)
-        slow_time_buffer_data = np.zeros(buffer_data_size, dtype=np.complex128)
-        I_Q_envelop = np.zeros(buffer_data_size)
-        wrapped_phase_plot = np.zeros(buffer_data_size)
-        unwrapped_phase_plot = np.zeros(buffer_data_size)
-        filtered_breathing_plot = np.zeros(buffer_data_size)
-        filtered_heart_plot = np.zeros(buffer_data_size)
-        buffer_raw_I_Q_fft = np.zeros(fft_size_vital_signs)
-        phase_unwrap_fft = np.zeros(fft_size_vital_signs)
-        breathing_fft = np.zeros(fft_size_vital_signs)
-        heart_fft = np.zeros(fft_size_vital_signs)
+        range_fft_abs = np.zeros(int(fft_size_range_profile / 2), dtype=np.float32)
+        radar_time_stamp = CircularBuffer(buffer_data_size)
+        slow_time_buffer_data = CircularBuffer(buffer_data_size, dtype=np.complex64)
+        I_Q_envelop = CircularBuffer(buffer_data_size, dtype=np.float32)
+        # display and filter outputs are kept in float32; the unwrapped phase and the time stamps accumulate
+        # without bound and stay float64
+        wrapped_phase_plot = CircularBuffer(buffer_data_size, dtype=np.float32)
+        unwrapped_phase_plot = CircularBuffer(buffer_data_size)
+        filtered_breathing_plot = CircularBuffer(buffer_data_size, dtype=np.float32)
+        breathing_bandpass = CircularBuffer(breathing_savgol_length, dtype=np.float32)
+        filtered_heart_plot = CircularBuffer(buffer_data_size, dtype=np.float32)
+        # the same signals in degrees for display, converted once as the samples arrive
+        wrapped_phase_plot_deg = CircularBuffer(buffer_data_size, dtype=np.float32)
+        unwrapped_phase_plot_deg = CircularBuffer(buffer_data_size, dtype=np.float32)
+        filtered_breathing_plot_deg = CircularBuffer(buffer_data_size, dtype=np.float32)
+        filtered_heart_plot_deg = CircularBuffer(buffer_data_size, dtype=np.float32)
+        buffer_raw_I_Q_fft = np.zeros(fft_size_vital_signs, dtype=np.float32)
+        phase_unwrap_fft = np.zeros(fft_size_vital_signs // 2 + 1, dtype=np.float32)
+        breathing_fft = np.zeros(fft_size_vital_signs // 2 + 1, dtype=np.float32)
+        heart_fft = np.zeros(fft_size_vital_signs // 2 + 1, dtype=np.float32)
+        # centred copies of the four spectra for the spectrum plot, rewritten in place on every update
+        shifted_spectra = np.zeros((4, fft_size_vital_signs), dtype=np.float32)
+        # snapshots of the time plot buffers, also rewritten in place. Rows: envelope, wrapped, unwrapped, breathing
+        # and heart phase (degrees), breathing and heart rate, breathing phase of the breathing visualization
+        time_axis_snapshot = np.zeros(buffer_data_size)
+        slow_time_snapshot = np.zeros(buffer_data_size, dtype=np.complex64)
+        plot_snapshots = np.zeros((8, buffer_data_size), dtype=np.float32)
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        range_profile_peak_indices = np.zeros(buffer_data_size)
-        breathing_rate_estimation_index = np.zeros(buffer_data_size)
-        heart_rate_estimation_index = np.zeros(buffer_data_size)
-        breathing_rate_estimation_value = np.zeros(buffer_data_size)
-        heart_rate_estimation_value = np.zeros(buffer_data_size)
+        range_profile_peak_indices = CircularBuffer(buffer_data_size)
+        breathing_rate_estimation_index = CircularBuffer(buffer_data_size)
+        heart_rate_estimation_index = CircularBuffer(buffer_data_size)
+        breathing_rate_estimation_value = CircularBuffer(buffer_data_size)
+        heart_rate_estimation_value = CircularBuffer(buffer_data_size)
+        breathing_rate_mean = RollingMean(estimation_window_size)
+        heart_rate_mean = RollingMean(estimation_window_size)
         # For breathing visualization
-        inhalation_points_x = []
-        inhalation_points_y = []
-        exhalation_points_x = []
-        exhalation_points_y = []
+        breathing_points = (np.empty(0), np.empty(0), np.empty(0, dtype=object))
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         x_axis_range_profile = np.linspace(0, max_range, int(fft_size_range_profile / 2))
         x_axis_vital_signs_spectrum = np.linspace(-vital_signs_sample_rate / 2, vital_signs_sample_rate / 2,
@@ -906,6 +1167,9 @@ if __name__ == "__main__":
         radar_processor = RadarDataProcessor()
         process_thread = threading.Thread(target=radar_processor.process_data, args=())
         process_thread.start()
+        if ENABLE_OSC_OUTPUT and ENABLE_OSC_LOGGING:
+            osc_log_thread = threading.Thread(target=print_osc_log, daemon=True)
+            osc_log_thread.start()
 
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -0,0 +1,118 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Numba kernels of the vital signs pipeline.
+# Every kernel is declared with an explicit signature, so it is compiled when this module is imported rather than on
+# the first radar frame, and cache=True keeps the machine code on disk so later starts only load it.
+# Run `python vitals_kernels.py` once after installing or editing to fill the cache before a session.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+import numpy as np
+from numba import njit
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# peak detection
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+@njit('f8(f4[:], i8, i8)', cache=True, nogil=True)
+def best_peak(spectrum, index_start, index_end):
+    # highest local maximum in [index_start, index_end), 0 if there is none. A minimum peak distance never
+    # removes the highest peak, so this is what taking the largest scipy find_peaks result gives.
+    # The bin is refined by the vertex of the parabola through the peak and its two neighbours
+    best_index = 0
+    best_value = -np.inf
+    for i in range(index_start + 1, index_end - 1):
+        if spectrum[i] > spectrum[i - 1] and spectrum[i] > spectrum[i + 1] and spectrum[i] > best_value:
+            best_value = spectrum[i]
+            best_index = i
+    if best_index == 0:
+        return 0.0
+    # both neighbours are strictly lower, so the curvature is negative and the offset stays within half a bin
+    left = spectrum[best_index - 1] - best_value
+    right = spectrum[best_index + 1] - best_value
+    return best_index + 0.5 * (left - right) / (left + right)
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# phase unwrap and filtering
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+@njit('void(f8[::1], f8, f8, f8[::1])', cache=True, nogil=True)
+def continue_unwrap(wrapped_phase, previous_wrapped, previous_unwrapped, out):
+    # np.unwrap of new samples, continued from the last wrapped / unwrapped sample of the previous call.
+    # The wrapped phase is float64 too: a float32 pi is not exactly pi, and the tie rule below would miss it
+    for i in range(wrapped_phase.shape[0]):
+        delta = wrapped_phase[i] - previous_wrapped
+        # same rule as np.unwrap: only steps of at least pi are corrected, and a step of exactly +pi is kept
+        if abs(delta) >= np.pi:
+            wrapped_delta = delta - 2 * np.pi * np.floor((delta + np.pi) / (2 * np.pi))
+            if wrapped_delta == -np.pi and delta > 0:
+                wrapped_delta = np.pi
+            delta = wrapped_delta
+        previous_unwrapped += delta
+        previous_wrapped = wrapped_phase[i]
+        out[i] = previous_unwrapped
+
+
+@njit('void(f8[::1], f8[::1], f8[::1])', cache=True, nogil=True, fastmath=True)
+def fir_filter_valid(data, taps, out):
+    # np.convolve(data, taps, 'valid'), out holds len(data) - len(taps) + 1 samples.
+    # fastmath lets the tap sum be reordered, so the inner loop is vectorized
+    num_taps = taps.shape[0]
+    for i in range(out.shape[0]):
+        acc = 0.0
+        for k in range(num_taps):
+            acc += taps[k] * data[i + num_taps - 1 - k]
+        out[i] = acc
+
+
+@njit('void(f8[::1], f8[:, :], f8[::1])', cache=True, nogil=True)
+def hp_filter_cycle(data, cholesky, out):
+    # data minus its Hodrick-Prescott trend. The trend solves U'U trend = data, U being the upper banded Cholesky
+    # factor from scipy cholesky_banded (bandwidth 2). out first holds the forward substitution result
+    n = data.shape[0]
+    for j in range(n):
+        acc = data[j]
+        if j >= 1:
+            acc -= cholesky[1, j] * out[j - 1]
+        if j >= 2:
+            acc -= cholesky[0, j] * out[j - 2]
+        out[j] = acc / cholesky[2, j]
+    # back substitution, the last two trend samples are carried in locals as out is overwritten with the cycle
+    trend_1 = 0.0
+    trend_2 = 0.0
+    for i in range(n - 1, -1, -1):
+        acc = out[i]
+        if i + 1 < n:
+            acc -= cholesky[1, i + 1] * trend_1
+        if i + 2 < n:
+            acc -= cholesky[0, i + 2] * trend_2
+        trend = acc / cholesky[2, i]
+        out[i] = data[i] - trend
+        trend_2 = trend_1
+        trend_1 = trend
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# vital signs FFT input
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+@njit('void(f8[::1], f4[::1], f4[::1], f4[::1], f4[:, ::1])', cache=True, nogil=True)
+def window_vital_signs(unwrapped_phase, breathing, heart, window, out):
+    # the three windowed signals written into the rows of the zero-padded FFT input in a single pass,
+    # columns past len(window) are left untouched
+    for i in range(window.shape[0]):
+        out[0, i] = unwrapped_phase[i] * window[i]
+        out[1, i] = breathing[i] * window[i]
+        out[2, i] = heart[i] * window[i]
+
+
+if __name__ == '__main__':
+    # importing the module above already compiled (or loaded) every kernel
+    # continue_unwrap must agree with np.unwrap, also on steps of exactly +-pi, when fed in chunks
+    check_phase = np.array([0, np.pi, 0, -np.pi, np.pi, -np.pi, -np.pi, 0.5, -np.pi, 3.0, -3.0, np.pi, 0])
+    random_walk = np.cumsum(np.random.default_rng(0).normal(0, 1.5, 200))
+    check_phase = np.concatenate([check_phase, np.angle(np.exp(1j * random_walk))])
+    check_out = np.empty_like(check_phase)
+    last_wrapped = last_unwrapped = 0.0
+    for start in range(0, len(check_phase), 7):
+        chunk = check_phase[start:start + 7]
+        continue_unwrap(chunk, last_wrapped, last_unwrapped, check_out[start:start + 7])
+        last_wrapped, last_unwrapped = chunk[-1], check_out[start + len(chunk) - 1]
+    assert np.allclose(check_out, np.unwrap(np.concatenate([[0.0], check_phase]))[1:]), 'continue_unwrap != np.unwrap'
+    print('vital signs kernels compiled and cached')